@@ -134,6 +134,38 @@ def get_available_gpu_id_list(limit=1):
     return gpu_available_list
 
 
+def get_available_gpu_id_list_nvml(gpu_count):
+    """Vectorized replacement for get_available_gpu_id_list on NVIDIA hosts.
+
+    GPUtil shells out to nvidia-smi and parses its text output per call; this
+    path queries NVML directly (already initialized by get_gpu_count_vendor)
+    and reduces the per-GPU readings with numpy, using the same availability
+    thresholds (load < 1%, memory used < 1%) and memory ordering as GPUtil.
+    Returns None when NVML or numpy is unavailable so callers can fall back.
+    """
+    if gpu_count <= 0:
+        return []
+
+    try:
+        import numpy as np
+        import nvidia_smi
+
+        handles = [nvidia_smi.nvmlDeviceGetHandleByIndex(i) for i in range(gpu_count)]
+        loads = np.fromiter(
+            (nvidia_smi.nvmlDeviceGetUtilizationRates(handle).gpu for handle in handles),
+            dtype=np.int32, count=gpu_count)
+        mem_infos = [nvidia_smi.nvmlDeviceGetMemoryInfo(handle) for handle in handles]
+        mem_used_fraction = np.fromiter(
+            (mem_info.used / mem_info.total for mem_info in mem_infos),
+            dtype=np.float64, count=gpu_count)
+
+        available_ids = np.where((loads < 1) & (mem_used_fraction < 0.01))[0]
+        available_ids = available_ids[np.argsort(mem_used_fraction[available_ids])]
+        return available_ids.tolist()
+    except Exception as e:
+        return None
+
+
 def get_host_name():
     host_name = None
     try:
@@ -156,22 +188,30 @@ def generate_yaml_doc(yaml_object, yaml_file, append=False):
         pass
 
 
+GPU_COUNT_VENDOR_UNKNOWN = (0, "")
+_gpu_count_vendor_cached = None
+
+
 def get_gpu_count_vendor():
-    gpu_count = 0
-    gpu_vendor = ""
+    # The installed GPU count and vendor never change while the process is
+    # alive, so probe NVML once and keep the library initialized instead of
+    # paying nvmlInit/nvmlShutdown on every sample.
+    global _gpu_count_vendor_cached
+    if _gpu_count_vendor_cached is not None:
+        return _gpu_count_vendor_cached
+
+    gpu_count, gpu_vendor = GPU_COUNT_VENDOR_UNKNOWN
     try:
         import nvidia_smi
 
         nvidia_smi.nvmlInit()
-        handle = nvidia_smi.nvmlDeviceGetHandleByIndex(0)
-        info = nvidia_smi.nvmlDeviceGetMemoryInfo(handle)
         gpu_count = nvidia_smi.nvmlDeviceGetCount()
         gpu_vendor = "nvidia"
-        nvidia_smi.nvmlShutdown()
     except:
         pass
 
-    return gpu_count, gpu_vendor
+    _gpu_count_vendor_cached = (gpu_count, gpu_vendor)
+    return _gpu_count_vendor_cached
 
 
 def get_running_info(cs_home_dir, cs_info_dir):
@@ -808,16 +848,33 @@ def decode_our_err_result(out_err):
         return out_err
 
 
+_cpu_percent_has_baseline = False
+
+
 def get_sys_realtime_stats():
+    global _cpu_percent_has_baseline
+
     sys_mem = psutil.virtual_memory()
     total_mem = sys_mem.total
     free_mem = sys_mem.available
-    total_disk_size = psutil.disk_usage("/").total
-    free_disk_size = psutil.disk_usage("/").free
-    cup_utilization = psutil.cpu_percent()
+    disk = psutil.disk_usage("/")
+    total_disk_size = disk.total
+    free_disk_size = disk.free
+    # psutil.cpu_percent(interval=None) reports 0.0 until a baseline reading
+    # exists, so block briefly once; afterwards the non-blocking call returns
+    # the real delta since the previous poll.
+    if not _cpu_percent_has_baseline:
+        cup_utilization = psutil.cpu_percent(interval=0.1)
+        _cpu_percent_has_baseline = True
+    else:
+        cup_utilization = psutil.cpu_percent(interval=None)
     cpu_cores = psutil.cpu_count()
-    gpu_cores_total, _ = get_gpu_count_vendor()
-    gpu_available_ids = get_available_gpu_id_list(limit=gpu_cores_total)
+    gpu_cores_total, gpu_vendor = get_gpu_count_vendor()
+    gpu_available_ids = None
+    if gpu_vendor == "nvidia":
+        gpu_available_ids = get_available_gpu_id_list_nvml(gpu_cores_total)
+    if gpu_available_ids is None:
+        gpu_available_ids = get_available_gpu_id_list(limit=gpu_cores_total)
     gpu_cores_available = len(gpu_available_ids) if gpu_available_ids is not None else 0
     net = psutil.net_io_counters()
     sent_bytes = net.bytes_sent
@@ -89,7 +89,7 @@ class MqttManager(object):
     def loop_forever(self):
         self._client.loop_forever(retry_first_connection=True)
 
-    def send_message(self, topic, message, publish_single_message=False):
+    def send_message(self, topic, message, publish_single_message=False, qos=2, retain=True):
         # logging.info(
         #     f"FedMLDebug - Send: topic ({topic}), message ({message})"
         # )
@@ -99,17 +99,17 @@ class MqttManager(object):
         if publish_single_message:
             connection_id = "FEDML_SINGLE_CONN_{}_{}".format(self._client_id,
                                                              str(mqtt.base62(uuid.uuid4().int, padding=22)))
-            mqtt_publish.single(topic, payload=message, qos=2,
+            mqtt_publish.single(topic, payload=message, qos=qos,
                                 hostname=self._host, port=self._port,
-                                client_id=connection_id, retain=True,
+                                client_id=connection_id, retain=retain,
                                 auth={'username': self.user, 'password': self.pwd})
         else:
-            ret_info = self._client.publish(topic, payload=message, qos=2, retain=True)
+            ret_info = self._client.publish(topic, payload=message, qos=qos, retain=retain)
             return ret_info.is_published()
         MLOpsProfilerEvent.log_to_wandb({"Comm/send_delay_mqtt": time.time() - mqtt_send_start_time})
         return True
 
-    def send_message_json(self, topic, message, publish_single_message=False):
+    def send_message_json(self, topic, message, publish_single_message=False, qos=2, retain=True):
         # logging.info(
         #     f"FedMLDebug - Send: topic ({topic}), message ({message})"
         # )
@@ -118,15 +118,22 @@ class MqttManager(object):
         if publish_single_message:
             connection_id = "FEDML_SINGLE_CONN_{}_{}".format(self._client_id,
                                                              str(mqtt.base62(uuid.uuid4().int, padding=22)))
-            mqtt_publish.single(topic, payload=message, qos=2,
+            mqtt_publish.single(topic, payload=message, qos=qos,
                                 hostname=self._host, port=self._port,
-                                client_id=connection_id, retain=True,
+                                client_id=connection_id, retain=retain,
                                 auth={'username': self.user, 'password': self.pwd})
         else:
-            ret_info = self._client.publish(topic, payload=message, qos=2, retain=True)
+            ret_info = self._client.publish(topic, payload=message, qos=qos, retain=retain)
             return ret_info.is_published()
         return True
 
+    def send_message_bytes(self, topic, payload, qos=2, retain=False):
+        # Publish an already-encoded payload without the extra str->bytes pass
+        # that send_message_json pays for serialized strings.
+        self.check_connection()
+        ret_info = self._client.publish(topic, payload=payload, qos=qos, retain=retain)
+        return ret_info.is_published()
+
     def on_connect(self, client, userdata, flags, rc):
         if rc == 0:
             client.connected_flag = True
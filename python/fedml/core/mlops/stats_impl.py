@@ -26,6 +26,25 @@ StatsDict = Dict[str, Union[float, Dict[str, float]]]
 # Eventually we can have the apple_gpu_stats binary query for this.
 M1_MAX_POWER_WATTS = 16.5
 
+# System-wide psutil counters change slowly compared to how often multiple
+# samplers may ask for them, so share one snapshot for up to a second instead
+# of re-reading /proc for every caller.
+_SYSTEM_COUNTERS_TTL_SECONDS = 1.0
+_system_counters_cache = {"timestamp": 0.0, "counters": None}
+
+
+def _cached_system_counters():
+    now = time.monotonic()
+    if _system_counters_cache["counters"] is None \
+            or now - _system_counters_cache["timestamp"] >= _SYSTEM_COUNTERS_TTL_SECONDS:
+        _system_counters_cache["counters"] = (
+            psutil.net_io_counters(),
+            psutil.virtual_memory(),
+            psutil.disk_usage("/"),
+        )
+        _system_counters_cache["timestamp"] = now
+    return _system_counters_cache["counters"]
+
 
 def gpu_in_use_by_this_process(gpu_handle: GPUHandle, pid: int) -> bool:
     if not psutil:
@@ -262,8 +281,7 @@ class WandbSystemStats:
                 pass
 
         if psutil:
-            net = psutil.net_io_counters()
-            sysmem = psutil.virtual_memory()
+            net, sysmem, disk = _cached_system_counters()
             stats["cpu"] = psutil.cpu_percent()
             stats["memory"] = sysmem.percent
             stats["network"] = {
@@ -271,12 +289,15 @@ class WandbSystemStats:
                 "recv": net.bytes_recv - self.network_init["recv"],
             }
             # TODO: maybe show other partitions, will likely need user to configure
-            stats["disk"] = psutil.disk_usage("/").percent
+            stats["disk"] = disk.percent
             stats["proc.memory.availableMB"] = sysmem.available / 1048576.0
             try:
-                stats["proc.memory.rssMB"] = self.proc.memory_info().rss / 1048576.0
-                stats["proc.memory.percent"] = self.proc.memory_percent()
-                stats["proc.cpu.threads"] = self.proc.num_threads()
+                proc = self.proc
+                # oneshot() coalesces the per-process /proc reads below into one pass.
+                with proc.oneshot():
+                    stats["proc.memory.rssMB"] = proc.memory_info().rss / 1048576.0
+                    stats["proc.memory.percent"] = proc.memory_percent()
+                    stats["proc.cpu.threads"] = proc.num_threads()
             except psutil.NoSuchProcess:
                 pass
         if self._tpu_profiler:
@@ -1,5 +1,7 @@
 import os
 
+import psutil
+
 from wandb.sdk.internal.settings_static import SettingsStatic
 from .stats_impl import WandbSystemStats
 
@@ -8,6 +10,13 @@ class SysStats:
     def __init__(self, process_id=None):
         settings = SettingsStatic(d={"_stats_pid": os.getpid() if process_id is None else process_id})
         self.sys_stats_impl = WandbSystemStats(settings=settings, interface=None)
+        # Prime the cpu_percent baseline so the first stats() pass does not
+        # report a false 0.0; samples are spaced by the caller's poll interval,
+        # which gives psutil a valid delta window without any blocking call.
+        try:
+            psutil.cpu_percent(interval=None)
+        except Exception as e:
+            pass
         self.gpu_time_spent_accessing_memory = 0.0
         self.gpu_power_usage = 0.0
         self.gpu_temp = 0.0
@@ -1,3 +1,5 @@
+import os
+
 import fedml
 
 from .constants import FEDML_TRAINING_PLATFORM_CROSS_DEVICE
@@ -11,11 +13,23 @@ def run_mnn_server():
 
     args = fedml.init()
 
-    # init device
-    device = fedml.device.get_device(args)
-
-    # load data
-    dataset, output_dim = fedml.data.load(args)
+    if os.environ.get("FEDML_PARALLEL_INIT", "false").lower() in ("true", "1"):
+        # Device acquisition and dataset loading are independent, so overlap
+        # them to cut server cold-start time; data load is usually the slower
+        # of the two.
+        import concurrent.futures
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+            device_future = executor.submit(fedml.device.get_device, args)
+            data_future = executor.submit(fedml.data.load, args)
+            device = device_future.result()
+            dataset, output_dim = data_future.result()
+    else:
+        # init device
+        device = fedml.device.get_device(args)
+
+        # load data
+        dataset, output_dim = fedml.data.load(args)
 
     # load model
     model = fedml.model.create(args, output_dim)
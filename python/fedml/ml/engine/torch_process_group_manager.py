@@ -1,12 +1,15 @@
 import logging
 import os
 
-import torch
-import torch.distributed as dist
-
 
 class TorchProcessGroupManager:
-    def __init__(self, rank, world_size, master_address, master_port, only_gpu):
+    def __init__(self, rank, world_size, master_address, master_port, only_gpu,
+                 messaging_ranks=None):
+        # torch is imported lazily so that importing this module on code paths
+        # that never touch distributed training does not pay the torch import.
+        import torch
+        import torch.distributed as dist
+
         logging.info("Start process group")
         logging.info(
             "rank: %d, world_size: %d, master_address: %s, master_port: %s"
@@ -33,12 +36,38 @@ class TorchProcessGroupManager:
         # initialize the process group
         dist.init_process_group(backend=backend)
 
-        self.messaging_pg = dist.new_group(backend=backend)
+        self.backend = backend
+        # When messaging only involves a subset of ranks (e.g. the coordinator
+        # plus trainers), restricting the group keeps NCCL communicator memory
+        # and init time at O(len(messaging_ranks)) instead of O(world_size).
+        self.messaging_ranks = messaging_ranks
+        # dist.new_group is a collective that blocks every rank, so defer it
+        # until the messaging group is actually requested.
+        self.messaging_pg = None
 
         logging.info("Initiated")
 
     def cleanup(self):
+        import torch.distributed as dist
+
         dist.destroy_process_group()
 
     def get_process_group(self):
+        # The first call is a collective: all ranks must reach it together,
+        # just as they previously had to reach the constructor together.
+        if self.messaging_pg is None:
+            import torch.distributed as dist
+
+            if self.messaging_ranks is not None:
+                try:
+                    # use_local_synchronization (torch >= 2.2) skips the global
+                    # barrier for ranks outside the subgroup.
+                    self.messaging_pg = dist.new_group(
+                        ranks=self.messaging_ranks, backend=self.backend,
+                        use_local_synchronization=True)
+                except TypeError:
+                    self.messaging_pg = dist.new_group(
+                        ranks=self.messaging_ranks, backend=self.backend)
+            else:
+                self.messaging_pg = dist.new_group(backend=self.backend)
         return self.messaging_pg